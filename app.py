@@ -1,11 +1,20 @@
 import os
 import re
 import json
+import math
 import time
 import html
+import gzip
+import pickle
+import hashlib
 import datetime as dt
-from urllib.parse import urlparse, quote
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from urllib.parse import quote
 
+import requests
 import streamlit as st
 
 try:
@@ -13,8 +22,19 @@ try:
 except Exception:
     feedparser = None
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
 APP_TITLE = "Newsboard RSS"
-ARCHIVE_PATH = "archive.json"
+ARCHIVE_PATH = "archive.jsonl"
+_LEGACY_ARCHIVE_PATH = "archive.json"
+FEEDS_PATH = "feeds.json"
+PAGE_SIZE = 25
+SNIPPET_LEN = 250
+CACHE_DIR = "cache"
+_HTTP_META_PATH = os.path.join(CACHE_DIR, "http_meta.json")
 
 st.set_page_config(page_title=APP_TITLE, layout="wide", page_icon="📰")
 
@@ -29,9 +49,20 @@ def _get_query_params():
         except Exception:
             return {}
 
+@lru_cache(maxsize=4096)
+def _netloc(url: str) -> str:
+    # Hot-path substitute for urlparse(url).netloc: entries from the same
+    # site hit the cache, and misses are two str.find calls instead of a
+    # full ParseResult allocation.
+    i = url.find("://")
+    if i < 0:
+        return ""
+    j = url.find("/", i + 3)
+    return url[i + 3 : j] if j > 0 else url[i + 3 :]
+
 def site_name_from_url(url: str) -> str:
     try:
-        netloc = urlparse(url).netloc
+        netloc = _netloc(url)
         if not netloc:
             return ""
         parts = [p for p in netloc.split(".") if p not in {"www", "m"}]
@@ -66,24 +97,95 @@ def human_time_ago(dt_obj):
     years = months // 12
     return f"{years} year{'s' if years != 1 else ''} ago"
 
+@lru_cache(maxsize=4096)
+def _to_dt(t6: tuple):
+    # Duplicate republishings and same-batch posts repeat timestamps often;
+    # memoizing skips the allocation for every repeat.
+    return dt.datetime(*t6, tzinfo=dt.timezone.utc)
+
 def try_parse_datetime(entry):
-    for f in ["published_parsed", "updated_parsed", "created_parsed"]:
-        tm_struct = entry.get(f)
-        if tm_struct:
+    get = entry.get
+    for f in ("published_parsed", "updated_parsed", "created_parsed"):
+        tm = get(f)
+        if tm:
             try:
-                return dt.datetime.fromtimestamp(time.mktime(tm_struct), tz=dt.timezone.utc)
+                # Positional construction straight from the struct_time.
+                # feedparser's *_parsed fields are UTC already; the old
+                # time.mktime round-trip wrongly treated them as local time.
+                return _to_dt(tuple(tm[:6]))
             except Exception:
                 pass
     return None
 
+# Precompiled at module scope so hot per-entry calls skip re's pattern cache.
+_SCRIPT_RE = re.compile(r"<script.*?>.*?</script>", re.DOTALL)
+_STYLE_RE = re.compile(r"<style.*?>.*?</style>", re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+_IMG_SRC_RE = re.compile(r'<img[^>]+src=["\']([^"\']+)["\']', re.IGNORECASE)
+
+# Single-pass HTML escape; cheaper than html.escape's chained replaces.
+_HTML_ESC = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"})
+
+# For text embedded in a double-quoted HTML attribute after _js_esc. The
+# single quote must stay raw here: the browser decodes entities before the
+# JS parser sees the string, so &#x27; would undo the backslash escape.
+_ATTR_ESC = str.maketrans({"&": "&amp;", '"': "&quot;"})
+
+def _js_esc(s: str) -> str:
+    """Escape a string for use inside a single-quoted inline-JS literal."""
+    return s.replace("\\", "\\\\").replace("'", "\\'").replace("<", "\\u003c")
+
+def _prep_item(item: dict) -> dict:
+    """Fill derived render fields in place so the display loop is pure emission.
+
+    No-op when the fields are already present; items restored from the
+    archive (which predate some fields) get them built here on first render.
+    """
+    if "_card_pre" in item:
+        return item
+    title_html = item.get("title_html") or item.get("title", "").translate(_HTML_ESC)
+    link_html = item.get("link_html") or item.get("link", "").translate(_HTML_ESC)
+    link_js = item.get("link_js") or _js_esc(item.get("link", "")).translate(_ATTR_ESC)
+    item["_title_block"] = f'<div class="card-title"><a href="{link_html}" target="_blank">{title_html}</a></div>'
+    item["_actions_html"] = (
+        f'<button class="icon-btn" title="Copy link" '
+        f"onclick=\"navigator.clipboard.writeText('{link_js}')\">🔗</button>"
+        f'<a class="icon-btn" href="{link_html}" target="_blank" title="Print view">🖨️</a>'
+    )
+    img = item.get("image")
+    fav = item.get("favicon")
+    site_html = item.get("site", "").translate(_HTML_ESC)
+    summary_html = item.get("summary", "").translate(_HTML_ESC)
+    img_html = f'<img class="card-img" src="{img.translate(_ATTR_ESC)}" alt="">' if img else ""
+    fav_html = f'<img class="card-fav" src="{fav.translate(_ATTR_ESC)}" alt="">' if fav else ""
+    # The card template is split around the time span: relative time is a
+    # function of "now", so it is inserted at render time by card_html
+    # rather than baked into any persisted or memoized string.
+    item["_card_pre"] = (
+        '<div class="card">'
+        f'<div class="card-main"><div class="card-body">{item["_title_block"]}'
+        f'<div class="card-summary">{summary_html}</div></div>{img_html}</div>'
+        f'<div class="card-meta">{fav_html}<span>{site_html}</span>'
+        '<span class="card-time">'
+    )
+    item["_card_post"] = (
+        f'</span><span class="card-actions">{item["_actions_html"]}</span></div>'
+        "</div>"
+    )
+    return item
+
+def card_html(item: dict) -> str:
+    item = _prep_item(item)
+    return item["_card_pre"] + human_time_ago(item.get("published_dt")) + item["_card_post"]
+
 def strip_html(text: str) -> str:
     if not text:
         return ""
-    text = re.sub(r"<script.*?>.*?</script>", "", text, flags=re.DOTALL)
-    text = re.sub(r"<style.*?>.*?</style>", "", text, flags=re.DOTALL)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+    text = _SCRIPT_RE.sub("", text)
+    text = _STYLE_RE.sub("", text)
+    text = _TAG_RE.sub(" ", text)
+    return _WS_RE.sub(" ", text).strip()
 
 def extract_image(entry):
     for key in ("media_content", "media_thumbnail"):
@@ -96,14 +198,14 @@ def extract_image(entry):
         if link.get("rel") == "enclosure" and str(link.get("type", "")).startswith("image"):
             return link.get("href")
     summary = entry.get("summary") or entry.get("description") or ""
-    m = re.search(r'<img[^>]+src=["\']([^"\']+)["\']', summary, flags=re.IGNORECASE)
+    m = _IMG_SRC_RE.search(summary)
     if m:
         return m.group(1)
     return None
 
 def google_favicon(url: str) -> str:
     try:
-        domain = urlparse(url).netloc
+        domain = _netloc(url)
         if not domain:
             return ""
         return f"https://www.google.com/s2/favicons?domain={domain}&sz=64"
@@ -132,7 +234,7 @@ def make_apa_citation(item: dict) -> str:
     else:
         author_field = item.get("site", "")
     pub_dt = item.get("published_dt")
-    date_str = f"{pub_dt.year}, {pub_dt.strftime('%B')} {pub_dt.day}" if pub_dt else dt.datetime.now().strftime("%Y")
+    date_str = f"{pub_dt.year}, {pub_dt.strftime('%B')} {pub_dt.day}" if pub_dt else "n.d."
     title = item.get("title", "").strip()
     if title:
         title = title[:1].upper() + title[1:]
@@ -140,52 +242,333 @@ def make_apa_citation(item: dict) -> str:
     url = item.get("link", "").strip()
     return f"{author_field} ({date_str}). {title}. {site}. {url}"
 
-def load_archive():
-    if os.path.exists(ARCHIVE_PATH):
+def citation_for(item: dict) -> str:
+    # Citation text is deterministic in the entry; build it once and keep it
+    # on the dict so repeat toggles across reruns are a lookup.
+    cite = item.get("_citation")
+    if cite is None:
+        cite = item["_citation"] = make_apa_citation(item)
+    return cite
+
+def _json_default(obj):
+    if isinstance(obj, dt.datetime):
+        return obj.isoformat()
+    return str(obj)
+
+def load_json(path: str, default=None):
+    if os.path.exists(path):
         try:
-            with open(ARCHIVE_PATH, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(path, "rb") as f:
+                raw = f.read()
+            return orjson.loads(raw) if orjson is not None else json.loads(raw)
         except Exception:
-            return []
-    return []
+            return default
+    return default
+
+def _discard_tmp(tmp: str):
+    try:
+        os.unlink(tmp)
+    except OSError:
+        pass
+
+def save_json(path: str, obj, indent: bool = False):
+    # Write-then-rename so a crash or concurrent reader never sees a
+    # half-written file.
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            if orjson is not None:
+                f.write(orjson.dumps(obj, default=_json_default, option=orjson.OPT_INDENT_2 if indent else 0))
+            else:
+                f.write(
+                    json.dumps(obj, ensure_ascii=False, indent=2 if indent else None, default=_json_default).encode("utf-8")
+                )
+        os.replace(tmp, path)
+    except Exception:
+        _discard_tmp(tmp)
+        raise
+
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_load_json(path: str, mtime: float):
+    # mtime participates in the cache key, so saves invalidate automatically
+    # while unchanged files skip the disk read and JSON decode per rerun.
+    return load_json(path)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_load_jsonl(path: str, mtime: float):
+    items = []
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    items.append(orjson.loads(line) if orjson is not None else json.loads(line))
+    except FileNotFoundError:
+        return []
+    except Exception:
+        pass  # keep whatever parsed; a torn tail line is dropped
+    return items
+
+def load_archive():
+    # On-disk order is append (oldest first); the UI wants newest first.
+    if not os.path.exists(ARCHIVE_PATH) and os.path.exists(_LEGACY_ARCHIVE_PATH):
+        # One-time migration from the old whole-file JSON format.
+        save_archive(_cached_load_json(_LEGACY_ARCHIVE_PATH, _mtime(_LEGACY_ARCHIVE_PATH)) or [])
+    items = _cached_load_jsonl(ARCHIVE_PATH, _mtime(ARCHIVE_PATH))[::-1]
+    for item in items:
+        pub = item.get("published_dt")
+        if isinstance(pub, str):
+            try:
+                item["published_dt"] = dt.datetime.fromisoformat(pub)
+            except ValueError:
+                item["published_dt"] = None
+    return items
+
+# Derived fields are rebuilt by _prep_item on load; persisting them would
+# bloat the archive and freeze stale render output (published_human in
+# particular is a relative time that must not outlive the run it was
+# rendered in).
+_DERIVED_KEYS = frozenset({"title_html", "link_html", "link_js", "published_human"})
+
+def _slim_item(item: dict) -> dict:
+    return {k: v for k, v in item.items() if not k.startswith("_") and k not in _DERIVED_KEYS}
+
+def _dump_json_bytes(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default)
+    return json.dumps(obj, ensure_ascii=False, default=_json_default).encode("utf-8")
 
 def save_archive(items):
+    """Full rewrite, for the rare remove/clear paths; appends should use
+    _append_archive, which is O(1) in archive size."""
+    tmp = f"{ARCHIVE_PATH}.{os.getpid()}.tmp"
     try:
-        with open(ARCHIVE_PATH, "w", encoding="utf-8") as f:
-            json.dump(items, f, ensure_ascii=False, indent=2)
+        with open(tmp, "wb") as f:
+            for item in reversed(items):
+                f.write(_dump_json_bytes(_slim_item(item)) + b"\n")
+        os.replace(tmp, ARCHIVE_PATH)
+    except Exception:
+        _discard_tmp(tmp)
+
+def _append_archive(items):
+    try:
+        with open(ARCHIVE_PATH, "ab") as f:
+            for item in items:
+                f.write(_dump_json_bytes(_slim_item(item)) + b"\n")
     except Exception:
         pass
 
-def add_to_archive(item):
-    items = load_archive()
-    if not any(x.get("link") == item.get("link") for x in items):
-        items.insert(0, item)
-        save_archive(items)
+class _BloomFilter:
+    """Compact probabilistic membership test over archived links.
+
+    Sized for the requested capacity at the given false-positive rate; a
+    positive answer must be confirmed against the real link set.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self._num_bits = bits
+        self._num_hashes = max(1, round(bits / capacity * math.log(2)))
+        self._bits = bytearray((bits + 7) // 8)
+
+    def _positions(self, value: str):
+        # blake2b is the fastest hash in hashlib for short strings; 16 bytes
+        # give the two independent 64-bit halves double hashing needs.
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big")
+        for i in range(self._num_hashes):
+            yield (h1 + i * h2) % self._num_bits
+
+    def add(self, value: str):
+        for pos in self._positions(value):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+# Above this many archived links, skip materializing the confirmation set and
+# only reload it from disk on a bloom hit (rare on the happy path).
+_ARCHIVE_SET_MAX = 4096
+
+def _archive_index():
+    idx = st.session_state.get("_archive_index")
+    if idx is None:
+        links = [x.get("link") for x in load_archive() if x.get("link")]
+        bloom = _BloomFilter(capacity=max(1024, 2 * len(links)))
+        for link in links:
+            bloom.add(link)
+        # A plain (mutable) set so flushes can extend it in place.
+        idx = (bloom, set(links) if len(links) <= _ARCHIVE_SET_MAX else None)
+        st.session_state["_archive_index"] = idx
+    return idx
+
+def _invalidate_archive_index():
+    st.session_state.pop("_archive_index", None)
+
+def is_archived(link: str) -> bool:
+    if not link:
+        return False
+    if link in st.session_state.get("pending_archive", ()):
+        return True
+    bloom, links = _archive_index()
+    if link not in bloom:
+        return False
+    if links is None:
+        # Large archive: the set wasn't materialized up front. Build it on
+        # the first bloom hit and keep it in the index so subsequent hits
+        # (e.g. every archived entry with hide-archived on) stay O(1).
+        links = {x.get("link") for x in load_archive()}
+        st.session_state["_archive_index"] = (bloom, links)
+    return link in links
+
+def queue_archive(item):
+    """Queue an archive add and flush it right away.
+
+    The buffer still batches anything queued in the same run into one append
+    and dedupes against disk, but flushing here means a click is durable
+    immediately - fragment reruns never reach the end of the script, so a
+    deferred flush could lose the item if the session ended first."""
+    link = item.get("link")
+    if link and not is_archived(link):
+        st.session_state.setdefault("pending_archive", {})[link] = item
+        _flush_pending_archive()
+
+def _flush_pending_archive():
+    pending = st.session_state.get("pending_archive")
+    if not pending:
+        return
+    existing = {x.get("link") for x in load_archive()}
+    fresh = [item for link, item in pending.items() if link not in existing]
+    if fresh:
+        _append_archive(fresh)
+        # Adds can update the membership index in place (blooms only grow);
+        # removals still invalidate it wholesale.
+        idx = st.session_state.get("_archive_index")
+        if idx is not None:
+            bloom, links = idx
+            for item in fresh:
+                bloom.add(item["link"])
+                if links is not None:
+                    links.add(item["link"])
+    pending.clear()
 
 def remove_from_archive(link: str):
     save_archive([x for x in load_archive() if x.get("link") != link])
+    _invalidate_archive_index()
 
-def parse_feed(url: str, limit: int | None = None):
-    if feedparser is None:
-        st.error("Python package 'feedparser' is required. Install it with: pip install feedparser")
-        return []
+def _save_http_meta(meta: dict):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        save_json(_HTTP_META_PATH, meta)
+    except Exception:
+        pass
+
+@lru_cache(maxsize=1024)
+def _cache_path(url: str) -> str:
+    # Local dedup key, not a security boundary: a 64-bit blake2b digest is
+    # plenty and keeps filenames to 16 hex chars. Cached since every fetch,
+    # 304 and fallback path re-derives the same mapping.
+    return os.path.join(CACHE_DIR, hashlib.blake2b(url.encode("utf-8"), digest_size=8).hexdigest() + ".pkl.gz")
+
+def _load_cached_items(url: str):
     try:
-        fp = feedparser.parse(url)
+        with gzip.open(_cache_path(url), "rb") as f:
+            items = pickle.load(f)
+    except Exception:
+        return None
+    for item in items:
+        # The cache stores the slim projection; restore the sort key (the
+        # other derived fields are rebuilt by _prep_item at render).
+        if "_sort_key" not in item:
+            pub = item.get("published_dt")
+            item["_sort_key"] = pub.timestamp() if pub else 0.0
+    return items
+
+def _store_cached_items(url: str, items):
+    tmp = f"{_cache_path(url)}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # A 256 KiB buffer batches the dump into a few large write()s
+        # instead of many 8 KiB default-buffer syscalls.
+        with open(tmp, "wb", buffering=256 * 1024) as raw:
+            # Level 3 compresses repetitive item dicts ~5x and still encodes
+            # faster than the disk write it replaces.
+            with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=3) as f:
+                # Slim projection only: derived render fields are rebuilt
+                # fresh by _prep_item, so cache-served items never replay a
+                # stale relative-time string.
+                pickle.dump([_slim_item(item) for item in items], f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, _cache_path(url))
+    except Exception:
+        _discard_tmp(tmp)
+
+def parse_feed(url: str, limit: int | None = None, meta: dict | None = None, session=None):
+    """Fetch and normalize one feed, honoring HTTP conditional GET.
+
+    The fetch goes through a pooled requests.Session (connection and TLS
+    reuse across feeds; feedparser gets the response bytes and does no I/O).
+    meta is the stored {"etag": ..., "modified": ...} for this URL; on a 304
+    the previously cached items are returned without reparsing. Returns
+    (items, warning, new_meta) rather than calling st.* directly so it can
+    run on worker threads; callers surface warnings from the script thread.
+    """
+    if session is None:
+        session = requests.Session()
+    headers = {}
+    if meta:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("modified"):
+            headers["If-Modified-Since"] = meta["modified"]
+    try:
+        resp = session.get(url, headers=headers, timeout=10)
+        if resp.status_code == 304:
+            cached = _load_cached_items(url)
+            if cached is not None:
+                return cached, None, meta
+            # Validators said unchanged but the disk cache is gone; refetch.
+            resp = session.get(url, timeout=10)
+        resp.raise_for_status()
+        # Content-hash guard for origins that send no validators: an
+        # unchanged body skips the reparse and the cache rewrite entirely.
+        body_hash = hashlib.blake2b(resp.content, digest_size=8).hexdigest()
+        if meta and meta.get("body_hash") == body_hash:
+            cached = _load_cached_items(url)
+            if cached is not None:
+                return cached, None, meta
+        fp = feedparser.parse(resp.content)
     except Exception as e:
-        st.warning(f"Could not parse feed: {url}. {e}")
-        return []
+        cached = _load_cached_items(url)
+        if cached is not None:
+            return cached, None, meta
+        return [], f"Could not parse feed: {url}. {e}", None
+
+    entries = fp.entries
+    feed_title = fp.feed.get("title") if fp.feed else ""
+    bozo = getattr(fp, "bozo", 0)
+    # Drop the parser result now: it retains the raw XML, namespace maps and
+    # header dicts, so peak memory tracks the items we keep instead of the
+    # full parse (noticeable with 16 workers in flight).
+    del fp
 
     items = []
-    for entry in fp.entries:
+    for entry in entries:
         link = entry.get("link") or ""
         title = html.unescape(entry.get("title", "")).strip()
         summary = entry.get("summary") or entry.get("description") or ""
         summary = strip_html(summary)
-        if len(summary) > 250:
-            summary = summary[:250].rstrip() + "…"
+        if len(summary) > SNIPPET_LEN:
+            summary = summary[:SNIPPET_LEN].rstrip() + "…"
         img = extract_image(entry)
         published_dt = try_parse_datetime(entry)
-        site = site_name_from_url(link) or site_name_from_url(url) or (fp.feed.get("title") if fp and fp.feed else "")
+        site = site_name_from_url(link) or site_name_from_url(url) or feed_title
         authors = []
         if "authors" in entry and isinstance(entry["authors"], list):
             for a in entry["authors"]:
@@ -194,20 +577,40 @@ def parse_feed(url: str, limit: int | None = None):
                     authors.append(name)
         elif entry.get("author"):
             authors = [entry.get("author")]
-        items.append({
+        items.append(_prep_item({
             "title": title,
             "summary": summary,
             "link": link,
+            # Escaped once here so render passes are pure string emission.
+            "title_html": title.translate(_HTML_ESC),
+            "link_html": link.translate(_HTML_ESC),
+            "link_js": _js_esc(link).translate(_ATTR_ESC),
             "image": img,
             "published_dt": published_dt,
-            "published_human": human_time_ago(published_dt) if published_dt else "",
+            # Numeric key so sorting compares floats in C, not datetimes
+            # through a per-element lambda.
+            "_sort_key": published_dt.timestamp() if published_dt else 0.0,
             "site": site,
             "favicon": google_favicon(link),
             "authors": authors,
-        })
+        }))
         if limit and len(items) >= limit:
             break
-    return items
+    if not items and bozo:
+        # Unreachable host or mangled XML: serve the last good parse rather
+        # than blanking the feed until the origin recovers.
+        cached = _load_cached_items(url)
+        if cached is not None:
+            return cached, None, meta
+    if items or not bozo:
+        # Don't clobber a good cache with the empty result of a failed fetch.
+        _store_cached_items(url, items)
+    new_meta = {"body_hash": body_hash}
+    if resp.headers.get("ETag"):
+        new_meta["etag"] = resp.headers["ETag"]
+    if resp.headers.get("Last-Modified"):
+        new_meta["modified"] = resp.headers["Last-Modified"]
+    return items, None, new_meta
 
 def ensure_default_config():
     default_feeds = {
@@ -244,8 +647,17 @@ def ensure_default_config():
         ],
     }
     if "feeds" not in st.session_state:
-        st.session_state["feeds"] = default_feeds
-    else:
+        # A feeds.json next to app.py ([{"url": ..., "category": ...}, ...])
+        # takes precedence over the built-in defaults.
+        grouped = {}
+        seen_urls = set()
+        for entry in _cached_load_json(FEEDS_PATH, _mtime(FEEDS_PATH)) or []:
+            if isinstance(entry, dict) and entry.get("url") and entry["url"] not in seen_urls:
+                seen_urls.add(entry["url"])
+                grouped.setdefault(entry.get("category") or "Uncategorized", []).append(entry["url"])
+        st.session_state["_feeds_from_file"] = bool(grouped)
+        st.session_state["feeds"] = grouped or default_feeds
+    elif not st.session_state.get("_feeds_from_file"):
         for k, v in default_feeds.items():
             if k not in st.session_state["feeds"] or not isinstance(st.session_state["feeds"][k], list):
                 st.session_state["feeds"][k] = v
@@ -256,6 +668,136 @@ def ensure_default_config():
 
 ensure_default_config()
 
+# Data
+
+@st.cache_resource
+def _feed_pool():
+    # Feed fetching is network-bound; one shared pool persists across reruns.
+    return ThreadPoolExecutor(max_workers=16)
+
+@st.cache_resource
+def _http_session():
+    # One pooled session shared by the fetch workers, sized to the pool so
+    # feeds from the same host reuse connections (and TLS handshakes).
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = f"{APP_TITLE.replace(' ', '')}/1.0"
+    return session
+
+@st.cache_data(ttl=600, show_spinner="Loading articles…")
+def _load_entries(feed_pairs: tuple, per_feed: int = 20):
+    # Keyed on the (category, url) tuple itself so sidebar feed edits
+    # invalidate the cache immediately. One call covers every category:
+    # switching views never refetches.
+    http_meta = load_json(_HTTP_META_PATH, default={}) or {}
+    per_feed_items = []
+    meta_changed = False
+    session = _http_session()
+    # One fetch per unique URL; a URL listed under several categories is
+    # credited to the first (entries would collapse in the link dedupe
+    # below anyway).
+    url_to_cat = {}
+    for category, url in feed_pairs:
+        url_to_cat.setdefault(url, category)
+    futures = {
+        _feed_pool().submit(parse_feed, url, per_feed, http_meta.get(url), session): url
+        for url in url_to_cat
+    }
+    for fut in as_completed(futures):
+        url = futures[fut]
+        category = url_to_cat[url]
+        feed_items, warning, new_meta = fut.result()
+        if warning:
+            st.warning(warning)
+        if new_meta and new_meta != http_meta.get(url):
+            http_meta[url] = new_meta
+            meta_changed = True
+        for e in feed_items:
+            e["category"] = category
+        per_feed_items.append(feed_items)
+    if meta_changed:
+        # Prune validators for URLs no longer configured so the meta file
+        # doesn't grow with every feed ever tried.
+        _save_http_meta({u: m for u, m in http_meta.items() if u in url_to_cat})
+    # Flatten and dedupe by link in one pass through the C machinery (no
+    # intermediate flat list); the date sort below makes the final order
+    # independent of fetch-completion order.
+    items = list({e["link"]: e for e in chain.from_iterable(per_feed_items) if e.get("link")}.values())
+    items.sort(key=itemgetter("_sort_key"), reverse=True)
+    by_cat = {}
+    for e in items:
+        by_cat.setdefault(e["category"], []).append(e)
+    return items, by_cat
+
+def _feed_pairs():
+    return tuple(
+        (cat, url)
+        for cat in st.session_state["category_order"]
+        for url in st.session_state["feeds"].get(cat, [])
+    )
+
+def get_view():
+    """Session-level memo of (entries, by_category), keyed by a fetch epoch.
+
+    st.cache_data still hashes its arguments on every rerun; for reruns that
+    change no feed state even that is wasted work. Bumping _view_epoch (or
+    editing feeds in the sidebar) invalidates the memo, and a time bucket in
+    the key hands control back to _load_entries' TTL every 10 minutes so an
+    open tab still picks up new stories without a manual Refresh.
+    """
+    if feedparser is None:
+        st.error("Python package 'feedparser' is required. Install it with: pip install feedparser")
+        return [], {}
+    epoch = st.session_state.setdefault("_view_epoch", 0)
+    key = (epoch, int(time.time() // 600), _feed_pairs())
+    cached = st.session_state.get("_view")
+    if cached is None or cached[0] != key:
+        cached = (key, _load_entries(key[2]))
+        st.session_state["_view"] = cached
+    return cached[1]
+
+def get_category_items(category: str):
+    _entries, by_cat = get_view()
+    return by_cat.get(category, [])
+
+@lru_cache(maxsize=32)
+def _keyword_re(keywords: tuple):
+    # One compiled alternation per keyword list: the C regex engine does the
+    # multi-pattern scan in a single pass instead of a Python any() loop.
+    # Keywords and _search_text are both pre-lowered, so no IGNORECASE.
+    if not keywords:
+        return None
+    return re.compile("|".join(re.escape(k.lower()) for k in keywords))
+
+def visible_items(category: str):
+    items = get_category_items(category)
+    inc_re = _keyword_re(tuple(st.session_state.get("include_keywords", [])))
+    exc_re = _keyword_re(tuple(st.session_state.get("exclude_keywords", [])))
+    if inc_re or exc_re:
+        kept = []
+        for e in items:
+            # Built lazily and memoized on the dict: entries pay for the
+            # lowered concat only once, and only when filters are in use.
+            text = e.get("_search_text")
+            if text is None:
+                text = e["_search_text"] = f"{e.get('title', '')} {e.get('summary', '')}".lower()
+            if exc_re and exc_re.search(text):
+                continue
+            if inc_re and not inc_re.search(text):
+                continue
+            kept.append(e)
+        items = kept
+    if st.session_state.get("hide_archived"):
+        # is_archived is O(1) per entry: bloom screen, then set confirm.
+        items = [e for e in items if not is_archived(e.get("link"))]
+    if st.session_state.get("sort_order") == "Oldest first":
+        # Entries come out of the cached loader already sorted newest-first;
+        # the other order is a reversed copy, never a re-sort.
+        items = items[::-1]
+    return items
+
 # Styles
 
 st.markdown(
@@ -293,6 +835,27 @@ st.markdown(
         border-color: transparent !important;
     }
 
+    .icon-btn {
+        border: 0; background: transparent; cursor: pointer;
+        padding: 0 2px; font-size: 0.65rem; line-height: 1;
+    }
+
+    .card {
+        border: 1px solid rgba(255,255,255,0.12); border-radius: 8px;
+        padding: 12px 14px; margin-bottom: 8px;
+    }
+    .card-main { display: flex; gap: 12px; justify-content: space-between; }
+    .card-body { min-width: 0; }
+    .card-img { max-width: 200px; max-height: 130px; border-radius: 6px; object-fit: cover; }
+    .card-summary { margin-top: 4px; }
+    .card-meta {
+        display: flex; align-items: center; gap: 8px;
+        margin-top: 8px; font-size: 0.8rem; opacity: 0.75;
+    }
+    .card-fav { width: 16px; height: 16px; }
+    .card-time { margin-left: auto; }
+    .card-actions { white-space: nowrap; }
+
     .card-title { font-size: 1.35rem; font-weight: 600; line-height: 1.25; margin-bottom: 0.6rem; }
     h3 { margin-top: 1.0rem !important; margin-bottom: 0.35rem !important; }
     .section-h { margin-top: 1.0rem; margin-bottom: 0.4rem; }
@@ -305,16 +868,46 @@ st.markdown(
 
 with st.sidebar:
     st.header("Settings")
+    if st.button("🔄 Refresh feeds"):
+        _flush_pending_archive()
+        _load_entries.clear()
+        st.session_state["_view_epoch"] = st.session_state.get("_view_epoch", 0) + 1
+        st.rerun()
+    st.session_state["hide_archived"] = st.checkbox(
+        "Hide archived stories", value=st.session_state.get("hide_archived", False)
+    )
+    st.session_state["sort_order"] = st.radio(
+        "Sort", ["Newest first", "Oldest first"], horizontal=True,
+        index=1 if st.session_state.get("sort_order") == "Oldest first" else 0,
+    )
     per_col = st.slider("Stories per column", 3, 10, st.session_state["per_column"])
     st.session_state["per_column"] = per_col
 
+    with st.expander("Keyword filters"):
+        inc_txt = st.text_area(
+            "Only show stories matching",
+            "\n".join(st.session_state.get("include_keywords", [])),
+            height=80,
+            key="inc_kw",
+            help="One keyword per line. Leave empty to show everything.",
+        )
+        exc_txt = st.text_area(
+            "Hide stories matching",
+            "\n".join(st.session_state.get("exclude_keywords", [])),
+            height=80,
+            key="exc_kw",
+        )
+        st.session_state["include_keywords"] = [l.strip() for l in inc_txt.splitlines() if l.strip()]
+        st.session_state["exclude_keywords"] = [l.strip() for l in exc_txt.splitlines() if l.strip()]
+
     st.caption("Edit feeds below. One feed per line.")
 
     # Editable feed URLs
     for cat in st.session_state["category_order"]:
         with st.expander(f"{cat} feeds"):
             txt = st.text_area(cat, "\n".join(st.session_state["feeds"].get(cat, [])), height=120, key=f"{cat}_feeds")
-            st.session_state["feeds"][cat] = [l.strip() for l in txt.splitlines() if l.strip()]
+            # dict.fromkeys: hash-based dedupe that keeps first-seen order.
+            st.session_state["feeds"][cat] = list(dict.fromkeys(l.strip() for l in txt.splitlines() if l.strip()))
 
     # Reorder categories (one per line). Unknown names ignored; omitted names appended at end.
     with st.expander("Category order"):
@@ -330,28 +923,17 @@ with st.sidebar:
         clean = [c for c in proposed if c in known] + [c for c in known if c not in proposed]
         st.session_state["category_order"] = clean
 
-    st.caption("Archive data is stored in archive.json next to app.py.")
-
-# Data
-
-@st.cache_data(ttl=300, show_spinner=False)
-def load_category_items(category: str, per_feed: int = 20):
-    items = []
-    for url in st.session_state["feeds"].get(category, []):
-        items.extend(parse_feed(url, limit=per_feed))
-    items.sort(key=lambda x: x.get("published_dt") or dt.datetime.min.replace(tzinfo=dt.timezone.utc), reverse=True)
-    return items
+    st.caption("Archive data is stored in archive.jsonl next to app.py.")
 
 # Card renderer
 
 def render_card(item: dict, key_prefix: str):
+    item = _prep_item(item)
     with st.container(border=True):
         left, right = st.columns([1.0, 0.33], gap="small")
         with left:
-            title = html.escape(item.get("title", ""))
-            link = html.escape(item.get("link", ""))
             summary = item.get("summary", "")
-            st.markdown(f'<div class="card-title"><a href="{link}" target="_blank">{title}</a></div>', unsafe_allow_html=True)
+            st.markdown(item["_title_block"], unsafe_allow_html=True)
             if summary:
                 st.write(summary)
         with right:
@@ -362,7 +944,7 @@ def render_card(item: dict, key_prefix: str):
         # Meta row
         fav = item.get("favicon")
         site = item.get("site", "")
-        time_h = item.get("published_human", "")
+        time_h = human_time_ago(item.get("published_dt"))
         m1, m2, m3 = st.columns([0.05, 0.65, 0.30])
         with m1:
             if fav:
@@ -375,51 +957,111 @@ def render_card(item: dict, key_prefix: str):
         # Final row: icons left (inline), citation right
         act_col, cite_col = st.columns([0.22, 0.78])
         with act_col:
-            i1, i2 = st.columns([1, 1])
+            i1, i2, i3 = st.columns([1, 1, 2])
             with i1:
                 if st.button("📑", key=f"apa_{key_prefix}", help="APA citation"):
                     st.session_state[f"show_apa_{key_prefix}"] = not st.session_state.get(f"show_apa_{key_prefix}", False)
             with i2:
                 if st.button("📥", key=f"arc_{key_prefix}", help="Save to archive"):
-                    add_to_archive(item)
+                    queue_archive(item)
                     st.toast("Saved to archive", icon="✅")
+                    if st.session_state.get("hide_archived"):
+                        # The card list itself changes; rerun the whole app.
+                        st.rerun(scope="app")
+            with i3:
+                # Copy-link and print-view are pure browser ops; render them as
+                # plain HTML instead of st.button so they cost no widget state.
+                st.markdown(item["_actions_html"], unsafe_allow_html=True)
         with cite_col:
             if st.session_state.get(f"show_apa_{key_prefix}"):
-                st.code(make_apa_citation(item))
+                st.code(citation_for(item))
 
 # Category views
 
+@st.fragment
+def render_articles(items, key_prefix: str):
+    # The whole page of cards goes out as ONE st.markdown: a single
+    # ForwardMsg instead of a handful of widget deltas per card. The only
+    # server-side widgets left are a per-page action bar below the grid.
+    st.markdown("".join(card_html(it) for it in items), unsafe_allow_html=True)
+    if not items:
+        return
+    sel_col, cite_col, arc_col = st.columns([0.62, 0.19, 0.19])
+    with sel_col:
+        idx = st.selectbox(
+            "Article",
+            range(len(items)),
+            format_func=lambda i: items[i].get("title", ""),
+            key=f"sel_{key_prefix}",
+            label_visibility="collapsed",
+        )
+    with cite_col:
+        if st.button("📑 Citation", key=f"apa_{key_prefix}"):
+            flag = f"show_apa_{key_prefix}"
+            st.session_state[flag] = not st.session_state.get(flag, False)
+    with arc_col:
+        if st.button("📥 Archive", key=f"arc_{key_prefix}"):
+            queue_archive(items[idx])
+            st.toast("Saved to archive", icon="✅")
+            if st.session_state.get("hide_archived"):
+                # The card list itself changes; rerun the whole app.
+                st.rerun(scope="app")
+    if st.session_state.get(f"show_apa_{key_prefix}"):
+        st.code(citation_for(items[idx]))
+
 def render_category_column(category: str, max_items: int):
     st.markdown(f'<h3 class="section-h">{html.escape(category)}</h3>', unsafe_allow_html=True)
-    items = load_category_items(category)
+    items = visible_items(category)
     if not items:
         st.info("No items found. Add feeds in the sidebar.")
         return
-    for i, item in enumerate(items[:max_items]):
-        render_card(item, key_prefix=f"{category}_{i}")
+    render_articles(items[:max_items], category)
     st.markdown(f'<a href="?view=category&name={quote(category)}">More</a>', unsafe_allow_html=True)
 
 def render_category_page(category: str):
     st.markdown(f'<h3 class="section-h">{html.escape(category)}</h3>', unsafe_allow_html=True)
-    for i, item in enumerate(load_category_items(category)):
-        render_card(item, key_prefix=f"{category}_full_{i}")
+    items = visible_items(category)
+    if not items:
+        st.info("No items found. Add feeds in the sidebar.")
+        return
+    # Render one page at a time so per-rerun work is capped at PAGE_SIZE
+    # cards no matter how large the category grows.
+    pages = (len(items) + PAGE_SIZE - 1) // PAGE_SIZE
+    page_key = f"page_{category}"
+    page = min(st.session_state.get(page_key, 0), pages - 1)
+    start = page * PAGE_SIZE
+    render_articles(items[start:start + PAGE_SIZE], f"{category}_full")
+    if pages > 1:
+        prev_col, info_col, next_col = st.columns([0.15, 0.70, 0.15])
+        with prev_col:
+            if st.button("← Prev", key=f"prev_{category}", disabled=page == 0):
+                st.session_state[page_key] = page - 1
+                st.rerun()
+        with info_col:
+            st.caption(f"Page {page + 1} of {pages}")
+        with next_col:
+            if st.button("Next →", key=f"next_{category}", disabled=page >= pages - 1):
+                st.session_state[page_key] = page + 1
+                st.rerun()
 
 def render_archive_page():
     st.subheader("Archived")
+    _flush_pending_archive()
     items = load_archive()
     if not items:
         st.info("Nothing here yet. Use the Archive icon on any card.")
         return
     if st.button("Clear all"):
         save_archive([])
-        st.experimental_rerun()
+        _invalidate_archive_index()
+        st.rerun()
     for i, item in enumerate(items):
         render_card(item, key_prefix=f"arch_{i}")
         col1, _, _ = st.columns([0.2, 0.4, 0.4])
         with col1:
             if st.button("🗑️ Remove", key=f"rm_{i}"):
                 remove_from_archive(item.get("link", ""))
-                st.experimental_rerun()
+                st.rerun()
 
 # Header and nav
 